@@ -20,6 +20,19 @@ app = typer.Typer(
 )
 console = Console()
 
+# Display format for each sync action type reported by SimpleSyncEngine
+_SYNC_ACTION_LABELS = {
+    "COPY_TO_VAULT1": "← Pulled {file}",
+    "COPY_TO_VAULT2": "→ Pushed {file}",
+    "OVERPOWER": "⚡ Forced {file}",
+    "USE_VAULT1": "✓ Used current version of {file}",
+    "USE_VAULT2": "✓ Used {vault} version of {file}",
+    "AUTO_MERGE_VAULT1": "⚡ Auto-merged (used current) {file}",
+    "AUTO_MERGE_VAULT2": "⚡ Auto-merged (used {vault}) {file}",
+    "CONFLICT": "⚠ Conflict: {file}",
+    "SKIP": "○ Skipped {file}",
+}
+
 
 @app.callback()
 def callback(
@@ -129,9 +142,7 @@ def register(
     path: Path = typer.Argument(..., help="Path to vault"),
 ) -> None:
     """Register a vault in the global config."""
-    config = GlobalConfig.load()
-    config.register_vault(name, str(path.resolve()))
-    config.save()
+    GlobalConfig.update(lambda config: config.register_vault(name, str(path.resolve())))
     console.print(f"[green]✓[/green] Registered vault '{name}' at {path}")
 
 
@@ -166,9 +177,7 @@ def init(
         sync_state_file.write_text("{}")
     
     # Register in global config
-    global_config = GlobalConfig.load_or_create()
-    global_config.register_vault(final_vault_id, str(path.absolute()))
-    global_config.save()
+    GlobalConfig.update(lambda config: config.register_vault(final_vault_id, str(path.absolute())))
     
     console.print(f"[green]✓[/green] Initialized Cast in {path}")
     console.print(f"  Vault ID: {final_vault_id}")
@@ -237,9 +246,11 @@ def sync(
     """
     from cast.sync_simple import SimpleSyncEngine
     
+    # Load global config once and share it with the engine
+    config = GlobalConfig.load()
+    
     # Determine vault path
     if vault:
-        config = GlobalConfig.load()
         vault_path = config.get_vault_path(vault)
         if not vault_path:
             vault_path = Path(vault)
@@ -252,7 +263,7 @@ def sync(
         console.print("Run 'cast init' to initialize a vault first.")
         raise typer.Exit(1)
     
-    engine = SimpleSyncEngine()
+    engine = SimpleSyncEngine(config)
     
     try:
         result = engine.sync_all(vault_path, overpower=overpower, interactive=not batch)
@@ -285,25 +296,9 @@ def sync(
             # Show actions taken
             if vault_result["actions"]:
                 for action in vault_result["actions"][:5]:  # Show first 5
-                    action_type = action["type"]
-                    if action_type == "COPY_TO_VAULT1":
-                        console.print(f"    ← Pulled {action['file']}")
-                    elif action_type == "COPY_TO_VAULT2":
-                        console.print(f"    → Pushed {action['file']}")
-                    elif action_type == "OVERPOWER":
-                        console.print(f"    ⚡ Forced {action['file']}")
-                    elif action_type == "USE_VAULT1":
-                        console.print(f"    ✓ Used current version of {action['file']}")
-                    elif action_type == "USE_VAULT2":
-                        console.print(f"    ✓ Used {vault_name} version of {action['file']}")
-                    elif action_type == "AUTO_MERGE_VAULT1":
-                        console.print(f"    ⚡ Auto-merged (used current) {action['file']}")
-                    elif action_type == "AUTO_MERGE_VAULT2":
-                        console.print(f"    ⚡ Auto-merged (used {vault_name}) {action['file']}")
-                    elif action_type == "CONFLICT":
-                        console.print(f"    ⚠ Conflict: {action['file']}")
-                    elif action_type == "SKIP":
-                        console.print(f"    ○ Skipped {action['file']}")
+                    label = _SYNC_ACTION_LABELS.get(action["type"])
+                    if label:
+                        console.print("    " + label.format(file=action["file"], vault=vault_name))
                 
                 if len(vault_result["actions"]) > 5:
                     console.print(f"    ... and {len(vault_result['actions']) - 5} more")
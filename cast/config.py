@@ -1,11 +1,15 @@
 """Configuration management for Cast."""
 
+import functools
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import platformdirs
 import yaml
+from filelock import FileLock
+
+from cast.util import YamlDumper, atomic_write, yaml_safe_load
 
 
 @dataclass
@@ -82,7 +86,7 @@ class VaultConfig:
         }
         
         with open(self.config_path, "w") as f:
-            yaml.safe_dump(data, f, sort_keys=False)
+            yaml.dump(data, f, Dumper=YamlDumper, sort_keys=False)
     
     @classmethod
     def load(cls, vault_root: Path) -> "VaultConfig":
@@ -92,8 +96,7 @@ class VaultConfig:
         if not config_path.exists():
             raise FileNotFoundError(f"No Cast configuration found at {config_path}")
         
-        with open(config_path) as f:
-            data = yaml.safe_load(f)
+        data = yaml_safe_load(config_path.read_bytes())
         
         config = cls(
             cast_version=data.get("cast-version", "1"),
@@ -123,6 +126,21 @@ class VaultConfig:
         
         return config
     
+    @classmethod
+    def load_cached(cls, vault_root: Path) -> "VaultConfig":
+        """Load configuration, reusing the last parse while config.yaml is unchanged.
+        
+        The returned instance is shared between callers - treat it as read-only.
+        """
+        config_path = vault_root / ".cast" / "config.yaml"
+        
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No Cast configuration found at {config_path}") from None
+        
+        return _load_vault_config(str(vault_root), stat.st_mtime_ns, stat.st_size)
+    
     @classmethod
     def create_default(cls, vault_root: Path, vault_id: Optional[str] = None) -> "VaultConfig":
         """Create default configuration for a vault."""
@@ -135,6 +153,16 @@ class VaultConfig:
         )
 
 
+@functools.lru_cache(maxsize=64)
+def _load_vault_config(vault_root: str, _mtime_ns: int, _size: int) -> VaultConfig:
+    """Parse a vault config, cached per version of the file (see VaultConfig.load_cached).
+    
+    _mtime_ns and _size are only part of the cache key, so an edited
+    config.yaml misses the cache and is parsed again.
+    """
+    return VaultConfig.load(Path(vault_root))
+
+
 @dataclass
 class GlobalConfig:
     """Global Cast configuration (per machine)."""
@@ -148,15 +176,14 @@ class GlobalConfig:
         return config_dir / "config.yaml"
     
     def save(self) -> None:
-        """Save global configuration."""
+        """Save global configuration (atomically, readers never see a partial file)."""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
         
         data = {
             "vaults": self.vaults,
         }
         
-        with open(self.config_path, "w") as f:
-            yaml.safe_dump(data, f, sort_keys=False)
+        atomic_write(self.config_path, yaml.dump(data, Dumper=YamlDumper, sort_keys=False))
     
     @classmethod
     def load(cls) -> "GlobalConfig":
@@ -164,9 +191,8 @@ class GlobalConfig:
         config = cls()
         
         if config.config_path.exists():
-            with open(config.config_path) as f:
-                data = yaml.safe_load(f) or {}
-                config.vaults = data.get("vaults", {})
+            data = yaml_safe_load(config.config_path.read_bytes()) or {}
+            config.vaults = data.get("vaults", {})
         
         return config
     
@@ -180,6 +206,30 @@ class GlobalConfig:
         
         return config
     
+    @classmethod
+    def update(cls, fn: Callable[["GlobalConfig"], Any]) -> "GlobalConfig":
+        """Load, modify and save the global configuration as one locked step.
+        
+        Holding a lock across the read-modify-write keeps concurrent
+        commands (e.g. two `cast init` runs) from dropping each other's
+        changes.
+        
+        Args:
+            fn: Called with the freshly loaded configuration to change it in place
+            
+        Returns:
+            The saved configuration
+        """
+        config_path = cls().config_path
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with FileLock(f"{config_path}.lock"):
+            config = cls.load()
+            fn(config)
+            config.save()
+        
+        return config
+    
     @classmethod
     def create_default(cls) -> "GlobalConfig":
         """Create default global configuration."""
@@ -7,12 +7,22 @@ from typing import Any
 
 import yaml
 
+from cast.md import parse_frontmatter_yaml
+from cast.util import YamlDumper, atomic_write
+
 
 CAST_ID_PATTERN = re.compile(
     r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
     re.IGNORECASE,
 )
 
+# Standard cast-* fields, in the order they follow cast-id in frontmatter
+CAST_FIELD_ORDER = ("cast-type", "cast-version", "cast-vaults", "cast-codebases")
+
+# A top-level "key:" line - frontmatter starting with one is a block mapping
+# that a new first key can be prepended to as text
+_TOP_LEVEL_KEY_RE = re.compile(r"[A-Za-z][A-Za-z0-9_-]*:(?: .*)?")
+
 
 def is_valid_uuid(value: str) -> bool:
     """Check if a string is a valid UUID."""
@@ -34,60 +44,89 @@ def extract_frontmatter(content: str) -> tuple[dict[str, Any] | None, str, str]:
     if not isinstance(content, str):
         raise TypeError(f"extract_frontmatter expects a string, got {type(content)}: {content!r}")
     
-    # Be robust to CRLF frontmatter and normalize once
-    content = content.replace("\r\n", "\n").replace("\r", "\n")
+    # Be robust to CRLF frontmatter and normalize once (only copy when needed)
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
     
     if not content.startswith("---\n"):
         return None, "", content
     
-    # Find the closing ---
-    end_match = re.search(r"\n---\n", content[4:])
-    if not end_match:
+    # Find the closing --- without copying the content
+    end = content.find("\n---\n", 4)
+    if end == -1:
         return None, "", content
     
-    fm_text = content[4:end_match.start() + 4]
-    body = content[end_match.end() + 4:]
+    fm_text = content[4:end]
+    body = content[end + 5:]
     
     try:
-        fm_dict = yaml.safe_load(fm_text) or {}
+        fm_dict = parse_frontmatter_yaml(fm_text) or {}
     except yaml.YAMLError:
         return None, fm_text, body
     
     return fm_dict, fm_text, body
 
 
-def inject_cast_id(content: str, cast_id: str) -> str:
-    """Inject a cast-id into markdown content, ensuring it's the first field."""
-    fm_dict, fm_text, body = extract_frontmatter(content)
+def _order_frontmatter(fm_dict: dict[str, Any], cast_id: str) -> dict[str, Any]:
+    """Order frontmatter with cast-id first.
     
-    if fm_dict is None:
-        # No frontmatter, create one
-        fm_dict = {}
-    
-    # Create ordered dict with cast-id first
+    Order is: cast-id, standard cast-* fields, non-cast fields in their
+    original order, then any other cast-* fields.
+    """
     ordered_dict = {"cast-id": cast_id}
+    ordered_dict.update({field: fm_dict[field] for field in CAST_FIELD_ORDER if field in fm_dict})
     
-    # Add other cast-* fields in a specific order
-    cast_field_order = ["cast-type", "cast-version", "cast-vaults", "cast-codebases"]
-    for field in cast_field_order:
-        if field in fm_dict:
-            ordered_dict[field] = fm_dict[field]
-    
-    # Add remaining fields (non-cast fields)
+    # Partition the remaining keys in a single pass
+    extra_cast_fields = {}
     for key, value in fm_dict.items():
-        if key not in ordered_dict and not key.startswith("cast-"):
+        if key in ordered_dict:
+            continue
+        if key.startswith("cast-"):
+            extra_cast_fields[key] = value
+        else:
             ordered_dict[key] = value
     
-    # Add any remaining cast-* fields not in our standard order
-    for key, value in fm_dict.items():
-        if key not in ordered_dict and key.startswith("cast-"):
-            ordered_dict[key] = value
+    ordered_dict.update(extra_cast_fields)
+    return ordered_dict
+
+
+def frontmatter_in_order(fm_dict: dict[str, Any]) -> bool:
+    """Check if parsed frontmatter already has cast-id first and cast-* fields in order."""
+    return list(_order_frontmatter(fm_dict, fm_dict["cast-id"])) == list(fm_dict)
+
+
+def render_frontmatter(fm_dict: dict[str, Any], cast_id: str, body: str, fm_text: str | None = None) -> str:
+    """Build markdown content from parsed frontmatter and body, with cast-id first.
     
-    # Reconstruct content
-    fm_yaml = yaml.safe_dump(ordered_dict, sort_keys=False, allow_unicode=True)
+    When the original frontmatter text is given and the only change is a
+    missing leading cast-id, the line is spliced in front of that text
+    instead of re-dumping the YAML, which also keeps the user's formatting.
+    """
+    if (
+        fm_text is not None
+        and "cast-id" not in fm_dict
+        and _TOP_LEVEL_KEY_RE.fullmatch(fm_text.split("\n", 1)[0])
+        and list(_order_frontmatter(fm_dict, cast_id))[1:] == list(fm_dict)
+    ):
+        return f"---\ncast-id: {cast_id}\n{fm_text}\n---\n{body}"
+    
+    ordered_dict = _order_frontmatter(fm_dict, cast_id)
+    fm_yaml = yaml.dump(ordered_dict, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
     return f"---\n{fm_yaml}---\n{body}"
 
 
+def inject_cast_id(content: str, cast_id: str) -> str:
+    """Inject a cast-id into markdown content, ensuring it's the first field."""
+    fm_dict, fm_text, body = extract_frontmatter(content)
+    
+    if fm_dict is None:
+        # No frontmatter (or unreadable), create one
+        fm_dict = {}
+        fm_text = None
+    
+    return render_frontmatter(fm_dict, cast_id, body, fm_text)
+
+
 def ensure_cast_id_first(content: str) -> str:
     """Ensure cast-id is the first field in YAML frontmatter."""
     # Defensive check: ensure content is a string
@@ -99,29 +138,22 @@ def ensure_cast_id_first(content: str) -> str:
     if not fm_dict or "cast-id" not in fm_dict:
         return content  # No frontmatter or no cast-id, return as-is
     
-    # Create ordered dict with cast-id first
-    cast_id = fm_dict["cast-id"]
-    ordered_dict = {"cast-id": cast_id}
-    
-    # Add other cast-* fields in standard order
-    cast_field_order = ["cast-type", "cast-version", "cast-vaults", "cast-codebases"]
-    for field in cast_field_order:
-        if field in fm_dict:
-            ordered_dict[field] = fm_dict[field]
-    
-    # Add remaining non-cast fields
-    for key, value in fm_dict.items():
-        if key not in ordered_dict and not key.startswith("cast-"):
-            ordered_dict[key] = value
+    # Keys already in canonical order - keep the original text so callers
+    # see no change and skip the rewrite
+    if frontmatter_in_order(fm_dict):
+        return content
     
-    # Add any remaining cast-* fields not in standard order
-    for key, value in fm_dict.items():
-        if key not in ordered_dict and key.startswith("cast-"):
-            ordered_dict[key] = value
+    return render_frontmatter(fm_dict, fm_dict["cast-id"], body)
+
+
+def cast_id_from_frontmatter(fm_dict: dict[str, Any] | None) -> str | None:
+    """Get the valid cast-id from already parsed frontmatter."""
+    if fm_dict and "cast-id" in fm_dict:
+        cast_id = fm_dict["cast-id"]
+        if is_valid_uuid(str(cast_id)):
+            return str(cast_id)
     
-    # Reconstruct content
-    fm_yaml = yaml.safe_dump(ordered_dict, sort_keys=False, allow_unicode=True)
-    return f"---\n{fm_yaml}---\n{body}"
+    return None
 
 
 def get_cast_id(file_path: Path) -> str | None:
@@ -132,12 +164,7 @@ def get_cast_id(file_path: Path) -> str | None:
     content = file_path.read_text(encoding="utf-8")
     fm_dict, _, _ = extract_frontmatter(content)
     
-    if fm_dict and "cast-id" in fm_dict:
-        cast_id = fm_dict["cast-id"]
-        if is_valid_uuid(str(cast_id)):
-            return str(cast_id)
-    
-    return None
+    return cast_id_from_frontmatter(fm_dict)
 
 
 def add_cast_id_to_file(file_path: Path, dry_run: bool = False) -> dict[str, Any]:
@@ -171,9 +198,7 @@ def add_cast_id_to_file(file_path: Path, dry_run: bool = False) -> dict[str, Any
         new_content = inject_cast_id(content, new_id)
         
         # Write back atomically
-        temp_path = file_path.with_suffix(".tmp")
-        temp_path.write_text(new_content, encoding="utf-8")
-        temp_path.replace(file_path)
+        atomic_write(file_path, new_content)
         
         result["status"] = "added"
     else:
@@ -1,12 +1,36 @@
 """Index management for Cast vaults."""
 
-import json
+import functools
+import glob
+import hashlib
+import multiprocessing
+import os
+import re
+import stat
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from pathlib import Path
+from pathlib import Path, PurePath
 from typing import Any
 
 from cast.config import VaultConfig
-from cast.ids import get_cast_id, extract_frontmatter
+from cast.ids import (
+    cast_id_from_frontmatter,
+    extract_frontmatter,
+    frontmatter_in_order,
+    generate_cast_id,
+    render_frontmatter,
+)
+from cast.md import compute_digest, is_current_digest
+from cast.util import atomic_write, json_dumps, json_loads
+
+
+# Re-indexing fewer files than this isn't worth starting worker processes
+_PARALLEL_INDEX_MIN_FILES = 256
+
+# Worker processes available to indexing in total; callers indexing several
+# vaults at once split this between them
+INDEX_WORKERS = min(os.cpu_count() or 1, 8)
 
 
 class Index:
@@ -21,18 +45,12 @@ class Index:
     def load(self) -> None:
         """Load index from disk."""
         if self.index_path.exists():
-            with open(self.index_path) as f:
-                self.data = json.load(f)
+            self.data = json_loads(self.index_path.read_bytes())
     
     def save(self) -> None:
         """Save index to disk."""
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write atomically
-        temp_path = self.index_path.with_suffix(".tmp")
-        with open(temp_path, "w") as f:
-            json.dump(self.data, f, indent=2, sort_keys=True)
-        temp_path.replace(self.index_path)
+        atomic_write(self.index_path, json_dumps(self.data, indent=True, sort_keys=True), mode="wb")
     
     def get_entry(self, cast_id: str) -> dict[str, Any] | None:
         """Get index entry by cast-id."""
@@ -74,69 +92,46 @@ def index_file(file_path: Path, vault_root: Path, config: VaultConfig, auto_fix:
     content = file_path.read_text(encoding="utf-8")
     
     # Extract metadata
-    fm_dict, _, body = extract_frontmatter(content)
+    fm_dict, fm_text, body = extract_frontmatter(content)
     if fm_dict is None:
         fm_dict = {}
     
     # For multi-vault sync, we index all files with cast-id
     # The cast-vaults field is optional and used for filtering
     
-    # Get or create cast-id
-    cast_id = get_cast_id(file_path)
+    # Get or create cast-id (from the content already read)
+    cast_id = cast_id_from_frontmatter(fm_dict)
     if not cast_id:
         # Check if file has cast metadata but no ID
         if fm_dict and any(key.startswith("cast-") for key in fm_dict.keys()):
             if auto_fix:
-                # File has cast metadata, add a cast-id
-                from cast.ids import generate_cast_id, ensure_cast_id_first
-                import yaml
-                
-                # Add cast-id to frontmatter
+                # File has cast metadata, add a cast-id to frontmatter.
+                # The parsed frontmatter and body stay valid for the entry,
+                # so the rewritten file isn't parsed again
                 new_id = generate_cast_id()
-                fm_dict["cast-id"] = new_id
-                
-                # Reconstruct content with cast-id first
-                fm_yaml = yaml.safe_dump(fm_dict, sort_keys=False, allow_unicode=True)
-                updated_content = f"---\n{fm_yaml}---\n{body}"
-                updated_content = ensure_cast_id_first(updated_content)
-                
-                # Write back to file
-                file_path.write_text(updated_content, encoding="utf-8")
-                content = updated_content
+                atomic_write(file_path, render_frontmatter(fm_dict, new_id, body, fm_text))
                 cast_id = new_id
                 # Only print in verbose mode or when not auto-fixing during sync
-                import sys
                 if "--verbose" in sys.argv or "-v" in sys.argv:
                     print(f"Added cast-id to {file_path.relative_to(vault_root)}")
             else:
                 # Log warning but don't modify file
-                import sys
                 print(f"[Warning] File has cast metadata but no cast-id: {file_path.relative_to(vault_root)}", file=sys.stderr)
                 print(f"  Run 'cast index --fix' to automatically add cast-ids", file=sys.stderr)
-            
-            # Re-extract for consistency
-            fm_dict, _, body = extract_frontmatter(content)
         
         # If still no cast-id, skip this file
         if not cast_id:
             return None
-    else:
-        # Check if cast-id needs to be reordered to first position
-        from cast.ids import ensure_cast_id_first
-        reordered_content = ensure_cast_id_first(content)
-        if reordered_content != content:
-            # Write back the reordered content
-            file_path.write_text(reordered_content, encoding="utf-8")
-            content = reordered_content
-            fm_dict, _, body = extract_frontmatter(content)
-    
-    # Compute normalized digest (of body only, not YAML)
+    elif not frontmatter_in_order(fm_dict):
+        # cast-id needs to be reordered to first position. Files already in
+        # order (the steady state) skip the re-dump and write entirely
+        atomic_write(file_path, render_frontmatter(fm_dict, cast_id, body))
+    
     # Compute body-only digest (for sync comparison)
-    import hashlib
-    body_digest = f"sha256:{hashlib.sha256(body.encode()).hexdigest()}"
+    body_digest = compute_digest(body)
     
     # Get file stats
-    stat = file_path.stat()
+    file_stat = file_path.stat()
     
     # Build entry
     entry = {
@@ -148,29 +143,180 @@ def index_file(file_path: Path, vault_root: Path, config: VaultConfig, auto_fix:
         "cast_version": fm_dict.get("cast-version", "1"),  # Cast protocol version
         "category": fm_dict.get("category", ""),  # Local field
         "tags": fm_dict.get("tags", []),  # Local field
-        "updated": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
-        "size": stat.st_size,
+        "updated": datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+        "mtime_ns": file_stat.st_mtime_ns,  # Exact mtime for the unchanged-file check
+        "size": file_stat.st_size,
     }
     
     return {cast_id: entry}
 
 
-def build_index(vault_root: Path, rebuild: bool = False, auto_fix: bool = False) -> dict[str, dict[str, Any]]:
+def _recursive_md_prefix(pattern: str) -> str | None:
+    """Directory part of a "<dir>/**/*.md" pattern, or None for any other pattern."""
+    prefix, sep, tail = pattern.rpartition("**/*.md")
+    if tail or not sep or (prefix and not prefix.endswith("/")) or glob.has_magic(prefix):
+        return None
+    return prefix.rstrip("/")
+
+
+def _scan_markdown_files(directory: str):
+    """Yield (path, stat) for markdown files under directory, as "**/*.md" would match them.
+    
+    Walks with os.scandir so the directory listing supplies the file type
+    and each file needs a single stat. Like glob, hidden entries are
+    skipped and directories are visited in pre-order.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    subdirs = []
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        try:
+            if entry.is_dir():
+                subdirs.append(entry.path)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield entry.path, entry.stat()
+        except OSError:
+            continue
+    
+    for subdir in subdirs:
+        yield from _scan_markdown_files(subdir)
+
+
+def _glob_markdown_files(pattern: str):
+    """Yield (path, stat) for markdown files matching an arbitrary glob pattern."""
+    for path in glob.glob(pattern, recursive=True):
+        if not path.endswith(".md"):
+            continue
+        try:
+            file_stat = Path(path).stat()
+        except OSError:
+            continue
+        if stat.S_ISREG(file_stat.st_mode):
+            yield path, file_stat
+
+
+@functools.lru_cache(maxsize=32)
+def _exclude_matcher(patterns: tuple[str, ...]):
+    """Build a check equivalent to any(path.match(pattern) for pattern in patterns).
+    
+    Relative patterns using only "*" and "?" are compiled into one regex,
+    anchored at a component boundary on the right the way Path.match reads
+    them on Python 3.13 ("**" acts like "*", wildcards never match the
+    root). Any other pattern still goes to Path.match.
+    """
+    alternatives = []
+    fallback = []
+    for pattern in patterns:
+        pure = PurePath(pattern)
+        if os.name == "nt" or pure.anchor or not pure.parts or "[" in pattern:
+            fallback.append(pattern)
+            continue
+        
+        alternatives.append("/".join(
+            "".join("[^/]*" if c == "*" else "[^/]" if c == "?" else re.escape(c) for c in part)
+            for part in pure.parts
+        ))
+    
+    # A match starts at a component: after a "/", or at the start of a
+    # relative path (the root of an absolute path is never matched)
+    combined = re.compile(f"(?:^(?!/)|/)(?:{'|'.join(alternatives)})\\Z") if alternatives else None
+    
+    def is_excluded(file_path: Path) -> bool:
+        if combined is not None and combined.search(str(file_path)):
+            return True
+        return any(file_path.match(pattern) for pattern in fallback)
+    
+    return is_excluded
+
+
+def _iter_markdown_files(vault_root: Path, config: VaultConfig):
+    """Yield (path, stat) for the vault's markdown files matching the config's include/exclude patterns."""
+    is_excluded = _exclude_matcher(tuple(config.exclude_patterns))
+    
+    for pattern in config.include_patterns:
+        prefix = _recursive_md_prefix(pattern)
+        if prefix is not None:
+            # The common "<dir>/**/*.md" pattern - walk the tree directly
+            candidates = _scan_markdown_files(str(vault_root / prefix))
+        else:
+            candidates = _glob_markdown_files(str(vault_root / pattern))
+        
+        for path, file_stat in candidates:
+            file_path = Path(path)
+            
+            # Check if excluded
+            if is_excluded(file_path):
+                continue
+            
+            yield file_path, file_stat
+
+
+def _index_files(
+    paths: list[Path],
+    vault_root: Path,
+    config: VaultConfig,
+    auto_fix: bool,
+    max_workers: int | None = None,
+) -> list[dict[str, Any] | None]:
+    """Run index_file over many files, across a process pool for large batches.
+    
+    Files are independent (each worker reads, hashes and possibly rewrites
+    only its own file), so the YAML and hashing work scales with cores.
+    
+    Args:
+        max_workers: Worker processes to use at most (INDEX_WORKERS if None)
+    
+    Returns:
+        index_file results, in the order of paths
+    """
+    if max_workers is None:
+        max_workers = INDEX_WORKERS
+    
+    if len(paths) < _PARALLEL_INDEX_MIN_FILES or max_workers < 2:
+        return [index_file(path, vault_root, config, auto_fix=auto_fix) for path in paths]
+    
+    # Callers may be running on threads, where forking is unsafe
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    worker = functools.partial(index_file, vault_root=vault_root, config=config, auto_fix=auto_fix)
+    
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(start_method),
+    ) as executor:
+        return list(executor.map(worker, paths, chunksize=16))
+
+
+def build_index(
+    vault_root: Path,
+    rebuild: bool = False,
+    auto_fix: bool = False,
+    config: VaultConfig | None = None,
+    max_workers: int | None = None,
+) -> dict[str, dict[str, Any]]:
     """Build or update the vault index.
     
     Args:
         vault_root: Root directory of the vault
         rebuild: Force full rebuild instead of incremental
         auto_fix: If True, automatically add cast-id to files with cast metadata
+        config: Already loaded vault configuration (loaded from disk if None)
+        max_workers: Worker processes for re-indexing at most (INDEX_WORKERS if None)
         
     Returns:
         The complete index data
     """
-    # Load config
-    try:
-        config = VaultConfig.load(vault_root)
-    except FileNotFoundError:
-        config = VaultConfig.create_default(vault_root)
+    # Load config (parsed once per version of config.yaml)
+    if config is None:
+        try:
+            config = VaultConfig.load_cached(vault_root)
+        except FileNotFoundError:
+            config = VaultConfig.create_default(vault_root)
     
     # Load existing index
     index = Index(vault_root)
@@ -180,42 +326,34 @@ def build_index(vault_root: Path, rebuild: bool = False, auto_fix: bool = False)
     # Track seen files for cleanup
     seen_ids = set()
     
-    # Find all markdown files
-    import glob
-    files = []
-    for pattern in config.include_patterns:
-        full_pattern = vault_root / pattern
-        for path in glob.glob(str(full_pattern), recursive=True):
-            file_path = Path(path)
-            if file_path.is_file() and file_path.suffix == ".md":
-                # Check if excluded
-                exclude = False
-                for exc in config.exclude_patterns:
-                    if file_path.match(exc):
-                        exclude = True
-                        break
-                if not exclude:
-                    files.append(file_path)
-    
-    for file_path in files:
-        if file_path.suffix != ".md":
-            continue
-        
+    # Existing entries by relative path, so each file is matched in O(1)
+    path_to_id = {entry["path"]: cast_id for cast_id, entry in index.data.items()}
+    
+    # Files that need (re)indexing, each listed once even if several patterns match it
+    pending: dict[Path, None] = {}
+    
+    for file_path, file_stat in _iter_markdown_files(vault_root, config):
         # Check if we need to reindex
         if not rebuild:
-            existing = index.find_by_path(file_path)
-            if existing:
-                cast_id, entry = existing
-                stat = file_path.stat()
-                
-                # Skip if unchanged (mtime and size match)
-                if (entry.get("size") == stat.st_size and
-                    entry.get("updated") == datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat().replace("+00:00", "Z")):
+            cast_id = path_to_id.get(str(file_path.relative_to(vault_root)))
+            entry = index.data.get(cast_id) if cast_id else None
+            if entry:
+                # Skip if unchanged (mtime and size match) - the stored digest is still valid
+                if "mtime_ns" in entry:
+                    unchanged = entry["mtime_ns"] == file_stat.st_mtime_ns
+                else:
+                    # Entry written before mtime_ns was recorded
+                    updated = datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc)
+                    unchanged = entry.get("updated") == updated.isoformat().replace("+00:00", "Z")
+                # A digest from another algorithm must be recomputed to stay comparable
+                if unchanged and entry.get("size") == file_stat.st_size and is_current_digest(entry.get("digest")):
                     seen_ids.add(cast_id)
                     continue
         
-        # Index the file
-        result = index_file(file_path, vault_root, config, auto_fix=auto_fix)
+        pending[file_path] = None
+    
+    # Index the files
+    for result in _index_files(list(pending), vault_root, config, auto_fix, max_workers):
         if result:
             cast_id = list(result.keys())[0]
             entry = list(result.values())[0]
@@ -234,6 +372,89 @@ def build_index(vault_root: Path, rebuild: bool = False, auto_fix: bool = False)
     return index.data
 
 
+def update_index(
+    vault_root: Path,
+    paths: list[Path],
+    auto_fix: bool = False,
+    config: VaultConfig | None = None,
+    index_data: dict[str, dict[str, Any]] | None = None,
+    entries: dict[Path, dict[str, dict[str, Any]]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Re-index only the given files and save the index.
+    
+    Cheaper than build_index when the caller knows exactly which files
+    changed, e.g. the files a sync just copied into the vault.
+    
+    Args:
+        vault_root: Root directory of the vault
+        paths: Files (absolute, inside vault_root) that changed
+        auto_fix: If True, automatically add cast-id to files with cast metadata
+        config: Already loaded vault configuration (loaded from disk if None)
+        index_data: Current index data, updated in place (loaded from disk if None)
+        entries: Already known {cast_id: entry} results by path, used instead of
+                 re-reading those files (e.g. exact copies of indexed files)
+        
+    Returns:
+        The complete index data
+    """
+    # Load config (parsed once per version of config.yaml)
+    if config is None:
+        try:
+            config = VaultConfig.load_cached(vault_root)
+        except FileNotFoundError:
+            config = VaultConfig.create_default(vault_root)
+    
+    index = Index(vault_root)
+    if index_data is None:
+        index.load()
+    else:
+        index.data = index_data
+    
+    if not paths:
+        return index.data
+    
+    path_to_id = {entry["path"]: cast_id for cast_id, entry in index.data.items()}
+    
+    for file_path in paths:
+        # Drop whatever was indexed at this path before
+        old_id = path_to_id.pop(str(file_path.relative_to(vault_root)), None)
+        if old_id:
+            index.remove_entry(old_id)
+        
+        if not file_path.exists():
+            continue
+        
+        if entries and file_path in entries:
+            result = entries[file_path]
+        else:
+            result = index_file(file_path, vault_root, config, auto_fix=auto_fix)
+        if result:
+            index.data.update(result)
+    
+    index.save()
+    
+    return index.data
+
+
+def index_root_digest(index_data: dict[str, dict[str, Any]]) -> str:
+    """Compute a single digest summarizing an index.
+    
+    Covers each entry's cast-id, body digest and cast-vaults - everything
+    a sync decision depends on - so it only changes when a sync could.
+    
+    Args:
+        index_data: Index data as returned by build_index
+        
+    Returns:
+        Digest of the whole index
+    """
+    hasher = hashlib.sha256()
+    for cast_id in sorted(index_data):
+        entry = index_data[cast_id]
+        hasher.update(f"{cast_id}\0{entry.get('digest')}\0{entry.get('cast_vaults')}\n".encode())
+    return f"sha256:{hasher.hexdigest()}"
+
+
 def validate_index(vault_root: Path) -> list[dict[str, Any]]:
     """Validate index consistency.
     
@@ -246,9 +467,6 @@ def validate_index(vault_root: Path) -> list[dict[str, Any]]:
     index = Index(vault_root)
     index.load()
     
-    # Load config once
-    config = VaultConfig.load(vault_root)
-    
     # Check each entry
     for cast_id, entry in index.data.items():
         file_path = vault_root / entry["path"]
@@ -262,8 +480,12 @@ def validate_index(vault_root: Path) -> list[dict[str, Any]]:
             })
             continue
         
+        # Read once for both checks
+        content = file_path.read_text(encoding="utf-8")
+        fm_dict, _, body = extract_frontmatter(content)
+        
         # Check cast-id matches
-        actual_id = get_cast_id(file_path)
+        actual_id = cast_id_from_frontmatter(fm_dict)
         if actual_id != cast_id:
             issues.append({
                 "type": "id_mismatch",
@@ -273,10 +495,7 @@ def validate_index(vault_root: Path) -> list[dict[str, Any]]:
             })
         
         # Check digest matches (body-only, same as index_file)
-        content = file_path.read_text(encoding="utf-8")
-        from cast.ids import extract_frontmatter
-        _, _, body = extract_frontmatter(content)
-        actual_digest = f"sha256:{hashlib.sha256(body.encode()).hexdigest()}"
+        actual_digest = compute_digest(body)
         
         if actual_digest != entry["digest"]:
             issues.append({
@@ -1,12 +1,127 @@
 """Centralized markdown and frontmatter parsing utilities."""
 
+import hashlib
+import os
 import re
 import yaml
 from typing import Any, Tuple, Dict, Optional
 
+from cast.util import yaml_safe_load
+
+try:
+    import blake3
+except ImportError:  # Optional, only needed for CAST_DIGEST=blake3
+    blake3 = None
+
+
+def _check_digest_algorithm(name: str) -> str:
+    """Validate a CAST_DIGEST value.
+    
+    Args:
+        name: "blake3" or a fixed-length hashlib algorithm name
+        
+    Returns:
+        The algorithm name, unchanged
+    """
+    if name == "blake3":
+        if blake3 is None:
+            raise ValueError("CAST_DIGEST=blake3 requires the blake3 package")
+        return name
+    
+    # shake_* digests have no fixed length, so hexdigest() needs one
+    supported = {a for a in hashlib.algorithms_available if not a.startswith("shake_")}
+    if name not in supported:
+        raise ValueError(
+            f"Unsupported CAST_DIGEST={name!r}; use blake3 or one of: {', '.join(sorted(supported))}"
+        )
+    return name
+
+
+# Hash used for body digests: "sha256" (default, compatible with existing
+# indices and sync state), "blake3" or another fixed-length hashlib algorithm.
+# Every vault taking part in a sync must use the same algorithm.
+DIGEST_ALGORITHM = _check_digest_algorithm(os.environ.get("CAST_DIGEST", "sha256"))
 
 _FM_OPEN = "---\n"
-_FM_CLOSE_RE = re.compile(r"\n---\n")
+_FM_CLOSE = "\n---\n"
+
+
+# Frontmatter simple enough to read without a YAML parser: "key: value"
+# lines and block lists of plain words (no quotes, flow style, comments or
+# nesting). Everything else goes to the YAML parser.
+_SIMPLE_KEY_RE = re.compile(r"([A-Za-z][A-Za-z0-9_-]*):(?: +(\S.*))?")
+_SIMPLE_ITEM_RE = re.compile(r"( *)- +(\S.*)")
+_SIMPLE_SCALAR_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_./()-]*(?: [A-Za-z0-9_./()-]+)*")
+_SIMPLE_INT_RE = re.compile(r"0|[1-9][0-9]{0,17}")
+_YAML_STR_TAG = "tag:yaml.org,2002:str"
+_yaml_resolver = yaml.resolver.Resolver()
+
+
+def _is_plain_string(value: str) -> bool:
+    """Check YAML would read a value as this exact string (not a number, bool, date...)."""
+    return bool(_SIMPLE_SCALAR_RE.fullmatch(value)) and (
+        _yaml_resolver.resolve(yaml.ScalarNode, value, (True, False)) == _YAML_STR_TAG
+    )
+
+
+def _parse_simple_frontmatter(fm_text: str) -> dict[str, Any] | None:
+    """Parse frontmatter that only uses plain string keys, string/int values and lists.
+    
+    Returns:
+        The same dict YAML would produce, or None if the text needs the YAML parser
+    """
+    data: dict[str, Any] = {}
+    key = None
+    item_indent = None
+    
+    for line in fm_text.split("\n"):
+        item = _SIMPLE_ITEM_RE.fullmatch(line)
+        if item:
+            # List items belong to the last key without an inline value
+            if key is None or not _is_plain_string(item.group(2)):
+                return None
+            if item_indent is None:
+                item_indent = item.group(1)
+                data[key] = []
+            elif item.group(1) != item_indent:
+                return None
+            data[key].append(item.group(2))
+            continue
+        
+        match = _SIMPLE_KEY_RE.fullmatch(line)
+        if not match or not _is_plain_string(match.group(1)):
+            return None
+        
+        value = match.group(2)
+        if value is None:
+            key = match.group(1)
+            item_indent = None
+            data[key] = None
+        elif _is_plain_string(value):
+            key = None
+            data[match.group(1)] = value
+        elif _SIMPLE_INT_RE.fullmatch(value):
+            key = None
+            data[match.group(1)] = int(value)
+        else:
+            return None
+    
+    return data or None
+
+
+def parse_frontmatter_yaml(fm_text: str) -> Any:
+    """Parse frontmatter YAML.
+    
+    Plain "key: value" frontmatter is read directly; anything else goes
+    to the YAML parser.
+    
+    Raises:
+        yaml.YAMLError: If the text is not valid YAML
+    """
+    data = _parse_simple_frontmatter(fm_text)
+    if data is None:
+        data = yaml_safe_load(fm_text)
+    return data
 
 
 def split_frontmatter(content: str) -> Tuple[Optional[Dict[str, Any]], str, str]:
@@ -21,25 +136,26 @@ def split_frontmatter(content: str) -> Tuple[Optional[Dict[str, Any]], str, str]
         - frontmatter_text: Raw YAML text (without delimiters)  
         - body: Content after frontmatter
     """
-    # Normalize line endings
-    content = content.replace("\r\n", "\n").replace("\r", "\n")
+    # Normalize line endings (the scan is cheaper than copying clean content)
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
     
     # Check for frontmatter
     if not content.startswith(_FM_OPEN):
         return None, "", content
     
     # Find closing delimiter
-    m = _FM_CLOSE_RE.search(content, len(_FM_OPEN))
-    if not m:
+    end = content.find(_FM_CLOSE, len(_FM_OPEN))
+    if end == -1:
         return None, "", content
     
     # Extract frontmatter text (without delimiters)
-    fm_text = content[len(_FM_OPEN):m.start()]
-    body = content[m.end():]
+    fm_text = content[len(_FM_OPEN):end]
+    body = content[end + len(_FM_CLOSE):]
     
     # Parse YAML
     try:
-        fm = yaml.safe_load(fm_text) or {}
+        fm = parse_frontmatter_yaml(fm_text) or {}
         if not isinstance(fm, dict):
             fm = None
     except yaml.YAMLError:
@@ -89,6 +205,28 @@ def serialize_frontmatter(fm: Dict[str, Any], body: str) -> str:
     return f"---\n{yaml_str}---\n{body}"
 
 
+def compute_digest(body: str) -> str:
+    """Compute the sync digest of an already extracted markdown body.
+    
+    Args:
+        body: Markdown body (without frontmatter)
+        
+    Returns:
+        Digest prefixed with its algorithm, e.g. "sha256:..."
+    """
+    data = body.encode()
+    if DIGEST_ALGORITHM == "blake3":
+        hexdigest = blake3.blake3(data).hexdigest()
+    else:
+        hexdigest = hashlib.new(DIGEST_ALGORITHM, data).hexdigest()
+    return f"{DIGEST_ALGORITHM}:{hexdigest}"
+
+
+def is_current_digest(digest: str | None) -> bool:
+    """Check a stored digest was computed with the configured algorithm."""
+    return bool(digest) and digest.startswith(f"{DIGEST_ALGORITHM}:")
+
+
 def compute_body_digest(content: str) -> str:
     """Compute digest of markdown body only (ignoring frontmatter).
     
@@ -98,6 +236,5 @@ def compute_body_digest(content: str) -> str:
     Returns:
         SHA256 hex digest of the body content
     """
-    import hashlib
     _, _, body = split_frontmatter(content)
-    return f"sha256:{hashlib.sha256(body.encode()).hexdigest()}"
\ No newline at end of file
+    return compute_digest(body)
\ No newline at end of file
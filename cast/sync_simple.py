@@ -1,38 +1,112 @@
 """Simple, reliable sync engine for Cast."""
 
+import filecmp
+import functools
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
-import json
+
+from rich.columns import Columns
+from rich.console import Console
+from rich.panel import Panel
 
 from cast.config import GlobalConfig, VaultConfig
-from cast.index import build_index
+from cast.index import INDEX_WORKERS, build_index, index_root_digest, update_index
+from cast.md import split_frontmatter
+from cast.util import atomic_replace, atomic_write, json_dumps, json_loads
+
+# Characters of each body shown in a conflict prompt, and how much of a
+# file is read up front to find them
+CONFLICT_PREVIEW_CHARS = 500
+_PREVIEW_READ_CHARS = 8192
+
+
+def _read_preview_body(path: Path) -> str:
+    """Read a file's body for conflict display, only as far as the preview needs."""
+    with path.open(encoding="utf-8") as f:
+        content = f.read(_PREVIEW_READ_CHARS)
+        _, fm_text, body = split_frontmatter(content)
+        
+        # The file goes on and the preview isn't covered yet (short body, or
+        # frontmatter whose closing delimiter is past the window, whatever
+        # the line endings) - read the rest
+        unterminated = content.startswith(("---\n", "---\r")) and not fm_text
+        if len(content) == _PREVIEW_READ_CHARS and (len(body) <= CONFLICT_PREVIEW_CHARS or unterminated):
+            content += f.read()
+            _, _, body = split_frontmatter(content)
+    
+    return body
+
+
+def _moved_entry(entry: dict, dst: Path, vault_root: Path) -> dict:
+    """Index entry for a copy of an indexed file placed at dst."""
+    return {**entry, "path": str(dst.relative_to(vault_root)), "title": dst.stem}
+
+
+@functools.lru_cache(maxsize=2048)
+def _cast_vault_names(cast_vaults: tuple) -> frozenset[str]:
+    """Vault names from a cast-vaults list (format: "vault_name (role)").
+    
+    Cached because most files in a vault share the same few lists.
+    """
+    return frozenset(
+        vault_entry.split("(")[0].strip()
+        for vault_entry in cast_vaults
+        if isinstance(vault_entry, str)
+    )
+
+
+def _pair_root(index1: dict, index2: dict) -> str:
+    """Combined root digest of two indices, independent of their order."""
+    return "|".join(sorted((index_root_digest(index1), index_root_digest(index2))))
 
 
 class SyncState:
     """Tracks last sync digests between vaults."""
     
+    # On-disk layout version; unversioned files are the legacy flat layout
+    VERSION = 2
+    
     def __init__(self, vault_path: Path):
         """Initialize sync state for a vault."""
         self.vault_path = vault_path
         self.state_file = vault_path / ".cast" / "sync_state.json"
         self.state = {}
+        self.roots = {}
         self.load()
     
     def load(self):
-        """Load sync state from disk."""
+        """Load sync state from disk.
+        
+        Peer digests and pair roots are kept in separate sections so no
+        vault ID can collide with the roots. Legacy files mapped vault IDs
+        straight to digests; they load with empty roots, which only costs
+        one full comparison per peer.
+        """
         if self.state_file.exists():
             try:
-                with open(self.state_file) as f:
-                    self.state = json.load(f)
+                data = json_loads(self.state_file.read_bytes())
             except:
-                self.state = {}
+                data = {}
+            
+            if isinstance(data.get("version"), int):
+                self.state = data.get("peers", {})
+                self.roots = data.get("roots", {})
+            else:
+                self.state = data
+                self.roots = {}
     
     def save(self):
-        """Save sync state to disk."""
+        """Save sync state to disk.
+        
+        Serialized compactly in memory (the file is machine-only) and
+        written with a single atomic replace.
+        """
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        data = {"version": self.VERSION, "peers": self.state, "roots": self.roots}
+        atomic_write(self.state_file, json_dumps(data), mode="wb")
     
     def get_last_sync_digest(self, peer_vault_id: str, cast_id: str) -> str | None:
         """Get the last synced digest for a file with a peer vault.
@@ -55,14 +129,34 @@ class SyncState:
         if peer_vault_id not in self.state:
             self.state[peer_vault_id] = {}
         self.state[peer_vault_id][cast_id] = digest
+    
+    def get_last_sync_root(self, peer_vault_id: str) -> str | None:
+        """Get the combined index root recorded after the last clean sync with a peer."""
+        return self.roots.get(peer_vault_id)
+    
+    def set_last_sync_root(self, peer_vault_id: str, root: str):
+        """Record the combined index root after a clean sync with a peer.
+        
+        Args:
+            peer_vault_id: The vault ID from config (not folder name)
+            root: Combined root digest of both vaults' indices
+        """
+        self.roots[peer_vault_id] = root
 
 
 class SimpleSyncEngine:
     """Dead simple sync engine - no complex merging, just reliability."""
     
-    def __init__(self):
-        """Initialize sync engine."""
-        self.global_config = GlobalConfig.load()
+    def __init__(self, global_config: GlobalConfig | None = None):
+        """Initialize sync engine.
+        
+        Args:
+            global_config: Already loaded global config to reuse (loaded from disk if None)
+        """
+        self.global_config = global_config if global_config is not None else GlobalConfig.load()
+        
+        # Created on the first conflict prompt and reused afterwards
+        self._console: Console | None = None
     
     def sync_all(
         self,
@@ -95,24 +189,29 @@ class SimpleSyncEngine:
         if not current_path.exists():
             raise ValueError(f"Vault not found: {current_path}")
         
+        # Resolve once so registered paths compare reliably against it
+        current_path = current_path.resolve()
+        
         # Load current vault config
-        current_config = VaultConfig.load(current_path)
+        current_config = VaultConfig.load_cached(current_path)
         current_id = current_config.vault_id
         
-        # Find all other vaults
+        # Find all other vaults (a missing, unreadable or non-directory vault
+        # has no config to load)
         other_vaults = []
         for vault_name, vault_path_str in self.global_config.vaults.items():
-            vault_path = Path(vault_path_str)
-            if vault_path != current_path and vault_path.exists():
-                try:
-                    config = VaultConfig.load(vault_path)
-                    other_vaults.append({
-                        "name": vault_name,
-                        "path": vault_path,
-                        "config": config,
-                    })
-                except FileNotFoundError:
-                    continue
+            vault_path = Path(vault_path_str).resolve()
+            if vault_path == current_path:
+                continue
+            try:
+                config = VaultConfig.load_cached(vault_path)
+            except OSError:
+                continue
+            other_vaults.append({
+                "name": vault_name,
+                "path": vault_path,
+                "config": config,
+            })
         
         if not other_vaults:
             return {
@@ -120,12 +219,29 @@ class SimpleSyncEngine:
                 "message": "No other vaults found to sync with",
             }
         
-        # Auto-index all vaults with auto-fix enabled (to add cast-ids)
+        # Auto-index all vaults with auto-fix enabled (to add cast-ids).
+        # Vaults are independent, so their indexing runs concurrently
         print(f"Indexing {current_id}...")
-        build_index(current_path, rebuild=False, auto_fix=True)
-        index_file = current_path / ".cast" / "index.json"
-        with open(index_file) as f:
-            current_index = json.load(f)
+        for other in other_vaults:
+            print(f"Indexing {other['name']}...")
+        
+        # One job per directory, even if a vault is registered twice
+        to_index = {current_path: current_config}
+        for other in other_vaults:
+            to_index.setdefault(other["path"], other["config"])
+        
+        # The vaults share one budget of index worker processes, so a
+        # multi-vault sync doesn't start a full process pool per vault
+        max_workers = min(8, len(to_index))
+        index_workers = max(1, INDEX_WORKERS // max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                path: executor.submit(self._load_vault_index, path, config, max_workers=index_workers)
+                for path, config in to_index.items()
+            }
+            indices = {path: future.result() for path, future in futures.items()}
+        
+        current_index = indices[current_path]
         
         results = {
             "status": "completed",
@@ -134,21 +250,26 @@ class SimpleSyncEngine:
             "vaults": {},
         }
         
+        # Current vault's sync state is shared by every pair
+        current_state = SyncState(current_path)
+        
         # Process each vault
         for other in other_vaults:
             other_path = other["path"]
             other_name = other["name"]
             
-            print(f"Indexing {other_name}...")
-            build_index(other_path, rebuild=False, auto_fix=True)
-            index_file = other_path / ".cast" / "index.json"
-            with open(index_file) as f:
-                other_index = json.load(f)
+            other_index = indices[other_path]
+            
+            # Neither side changed since the last clean sync with this peer
+            if current_state.get_last_sync_root(other["config"].vault_id) == _pair_root(current_index, other_index):
+                results["vaults"][other_name] = {"synced": 0, "conflicts": 0, "actions": []}
+                continue
             
             vault_result = self._sync_vault_pair(
                 current_path,
                 current_index,
                 current_config,
+                current_state,
                 other_path,
                 other_index,
                 other["config"],
@@ -156,17 +277,34 @@ class SimpleSyncEngine:
                 interactive=interactive,
             )
             
+            # Saved alongside the peer's state so an interrupted run keeps both baselines
+            current_state.save()
+            
             results["vaults"][other_name] = vault_result
             results["synced"] += vault_result["synced"]
             results["conflicts"] += vault_result["conflicts"]
         
         return results
     
+    def _load_vault_index(self, vault_path: Path, config: VaultConfig, max_workers: int | None = None) -> dict:
+        """Bring a vault's index up to date and load it.
+        
+        Args:
+            vault_path: Vault to index
+            config: The vault's configuration
+            max_workers: Index worker processes this vault may use
+            
+        Returns:
+            The vault's index data
+        """
+        return build_index(vault_path, rebuild=False, auto_fix=True, config=config, max_workers=max_workers)
+    
     def _sync_vault_pair(
         self,
         vault1_path: Path,
         vault1_index: dict,
         vault1_config: VaultConfig,
+        sync_state1: SyncState,
         vault2_path: Path,
         vault2_index: dict,
         vault2_config: VaultConfig,
@@ -177,7 +315,8 @@ class SimpleSyncEngine:
         
         Args:
             vault1_path: First vault (current)
-            vault1_index: First vault's index
+            vault1_index: First vault's index (refreshed in place after copying)
+            sync_state1: First vault's sync state (saved by the caller after each pair)
             vault2_path: Second vault
             vault2_index: Second vault's index
             overpower: Force vault1's version
@@ -192,183 +331,222 @@ class SimpleSyncEngine:
             "actions": [],
         }
         
-        # Load sync states for both vaults
-        sync_state1 = SyncState(vault1_path)
+        # Load sync state for the peer vault
         sync_state2 = SyncState(vault2_path)
         
-        # Find all unique cast-ids
-        all_ids = set(vault1_index.keys()) | set(vault2_index.keys())
+        # Classify cast-ids in one pass over the key views
+        ids1 = vault1_index.keys()
+        ids2 = vault2_index.keys()
+        all_ids = ids1 | ids2
+        vault1_id = vault1_config.vault_id
+        vault2_id = vault2_config.vault_id
         
-        for cast_id in all_ids:
-            file1_info = vault1_index.get(cast_id)
-            file2_info = vault2_index.get(cast_id)
+        # (cast_id, src, dst) copies to run once every decision has been made
+        copies: list[tuple[str, Path, Path]] = []
+        
+        # Conflicts left for the user, asked about after the automatic copies
+        pending_conflicts: list[tuple[str, Path, Path]] = []
+        
+        # Case 1: Files only in vault1
+        for cast_id in ids1 - ids2:
+            file1_info = vault1_index[cast_id]
+            if not self._should_sync_file(file1_info, None, vault1_id, vault2_id):
+                continue
+            
+            copies.append((
+                cast_id,
+                vault1_path / file1_info["path"],
+                vault2_path / file1_info["path"],
+            ))
+            result["synced"] += 1
+            result["actions"].append({
+                "type": "COPY_TO_VAULT2",
+                "file": file1_info["path"],
+            })
+        
+        # Case 2: Files only in vault2 (if overpower, we ignore them)
+        if not overpower:
+            for cast_id in ids2 - ids1:
+                file2_info = vault2_index[cast_id]
+                if not self._should_sync_file(None, file2_info, vault1_id, vault2_id):
+                    continue
+                
+                copies.append((
+                    cast_id,
+                    vault2_path / file2_info["path"],
+                    vault1_path / file2_info["path"],
+                ))
+                result["synced"] += 1
+                result["actions"].append({
+                    "type": "COPY_TO_VAULT1",
+                    "file": file2_info["path"],
+                })
+        
+        # Case 3: Files in both vaults
+        for cast_id in ids1 & ids2:
+            file1_info = vault1_index[cast_id]
+            file2_info = vault2_index[cast_id]
+            
+            # Identical body on both sides - nothing to do, skip the cast-vaults check
+            if file1_info.get("digest") and file1_info.get("digest") == file2_info.get("digest"):
+                continue
             
             # Check if this file should sync between these vaults
-            should_sync = self._should_sync_file(
-                file1_info, file2_info, 
-                vault1_config.vault_id, vault2_config.vault_id
-            )
+            if not self._should_sync_file(file1_info, file2_info, vault1_id, vault2_id):
+                continue
+            
+            file1_path = vault1_path / file1_info["path"]
+            file2_path = vault2_path / file2_info["path"]
             
-            if not should_sync:
+            # Get current digests
+            digest1 = file1_info.get("digest")
+            digest2 = file2_info.get("digest")
+            
+            # If digests missing, compare full content (stops at the
+            # size check or the first differing block). Indexed sizes
+            # that differ already settle it without touching the files
+            if not digest1 or not digest2:
+                size1 = file1_info.get("size")
+                size2 = file2_info.get("size")
+                if size1 is not None and size2 is not None and size1 != size2:
+                    files_different = True
+                else:
+                    files_different = not filecmp.cmp(file1_path, file2_path, shallow=False)
+            else:
+                files_different = digest1 != digest2
+            
+            if not files_different:
                 continue
             
-            # Case 1: File only in vault1
-            if file1_info and not file2_info:
-                self._copy_file(
-                    vault1_path / file1_info["path"],
-                    vault2_path / file1_info["path"],
-                )
+            if overpower:
+                # Force vault1's version, whatever the baselines say
+                copies.append((cast_id, file1_path, file2_path))
                 result["synced"] += 1
                 result["actions"].append({
-                    "type": "COPY_TO_VAULT2",
+                    "type": "OVERPOWER",
                     "file": file1_info["path"],
                 })
+                continue
+            
+            # Files differ - check if we can auto-merge
+            last_sync1 = sync_state1.get_last_sync_digest(vault2_id, cast_id)
+            
+            # Auto-merge logic:
+            # - If vault1 changed but vault2 didn't (digest2 == last_sync): use vault1
+            # - If vault2 changed but vault1 didn't (digest1 == last_sync): use vault2
+            # - If both changed: conflict
+            can_auto_merge = False
+            auto_use_vault1 = False
             
-            # Case 2: File only in vault2
-            elif file2_info and not file1_info:
-                if not overpower:
-                    self._copy_file(
-                        vault2_path / file2_info["path"],
-                        vault1_path / file2_info["path"],
-                    )
+            if last_sync1 and digest2 == last_sync1:
+                # Vault2 hasn't changed since last sync, use vault1
+                can_auto_merge = True
+                auto_use_vault1 = True
+            else:
+                # Only look up vault2's baseline when vault1's didn't decide it
+                last_sync2 = sync_state2.get_last_sync_digest(vault1_id, cast_id)
+                if last_sync2 and digest1 == last_sync2:
+                    # Vault1 hasn't changed since last sync, use vault2
+                    can_auto_merge = True
+                    auto_use_vault1 = False
+            
+            if can_auto_merge:
+                # Auto-merge without prompting
+                if auto_use_vault1:
+                    copies.append((cast_id, file1_path, file2_path))
+                    result["synced"] += 1
+                    result["actions"].append({
+                        "type": "AUTO_MERGE_VAULT1",
+                        "file": file1_info["path"],
+                    })
+                else:
+                    copies.append((cast_id, file2_path, file1_path))
                     result["synced"] += 1
                     result["actions"].append({
-                        "type": "COPY_TO_VAULT1",
+                        "type": "AUTO_MERGE_VAULT2",
                         "file": file2_info["path"],
                     })
-                # If overpower, we ignore files only in vault2
-            
-            # Case 3: File in both vaults
-            elif file1_info and file2_info:
-                file1_path = vault1_path / file1_info["path"]
-                file2_path = vault2_path / file2_info["path"]
-                
-                # Get current digests
-                digest1 = file1_info.get("digest")
-                digest2 = file2_info.get("digest")
-                
-                # If digests missing, compare full content
-                if not digest1 or not digest2:
-                    content1 = file1_path.read_text()
-                    content2 = file2_path.read_text()
-                    files_different = content1 != content2
+            else:
+                # Files are different and can't auto-merge - handle conflict
+                if interactive:
+                    # Let user choose, once the automatic work is done
+                    pending_conflicts.append((cast_id, file1_path, file2_path))
                 else:
-                    files_different = digest1 != digest2
-                
-                if files_different:
-                    # Files differ - check if we can auto-merge
-                    last_sync1 = sync_state1.get_last_sync_digest(vault2_config.vault_id, cast_id)
-                    last_sync2 = sync_state2.get_last_sync_digest(vault1_config.vault_id, cast_id)
-                    
-                    # Auto-merge logic:
-                    # - If vault1 changed but vault2 didn't (digest2 == last_sync): use vault1
-                    # - If vault2 changed but vault1 didn't (digest1 == last_sync): use vault2
-                    # - If both changed: conflict
-                    can_auto_merge = False
-                    auto_use_vault1 = False
-                    
-                    if last_sync1 and digest2 == last_sync1:
-                        # Vault2 hasn't changed since last sync, use vault1
-                        can_auto_merge = True
-                        auto_use_vault1 = True
-                    elif last_sync2 and digest1 == last_sync2:
-                        # Vault1 hasn't changed since last sync, use vault2
-                        can_auto_merge = True
-                        auto_use_vault1 = False
-                    
-                    if can_auto_merge and not overpower:
-                        # Auto-merge without prompting
-                        if auto_use_vault1:
-                            self._copy_file(file1_path, file2_path)
-                            result["synced"] += 1
-                            result["actions"].append({
-                                "type": "AUTO_MERGE_VAULT1",
-                                "file": file1_info["path"],
-                            })
-                        else:
-                            self._copy_file(file2_path, file1_path)
-                            result["synced"] += 1
-                            result["actions"].append({
-                                "type": "AUTO_MERGE_VAULT2",
-                                "file": file2_info["path"],
-                            })
-                    else:
-                        # Files are different and can't auto-merge - handle conflict
-                        if overpower:
-                            # Force vault1's version
-                            self._copy_file(file1_path, file2_path)
-                            result["synced"] += 1
-                            result["actions"].append({
-                                "type": "OVERPOWER",
-                                "file": file1_info["path"],
-                            })
-                        elif interactive:
-                            # Let user choose
-                            choice = self._resolve_conflict_interactive(
-                                cast_id,
-                                file1_path,
-                                file2_path,
-                                vault1_path.name,
-                                vault2_path.name,
-                            )
-                            
-                            if choice == "1":
-                                self._copy_file(file1_path, file2_path)
-                                result["synced"] += 1
-                                result["actions"].append({
-                                    "type": "USE_VAULT1",
-                                    "file": file1_info["path"],
-                                })
-                            elif choice == "2":
-                                self._copy_file(file2_path, file1_path)
-                                result["synced"] += 1
-                                result["actions"].append({
-                                    "type": "USE_VAULT2",
-                                    "file": file2_info["path"],
-                                })
-                            else:
-                                result["conflicts"] += 1
-                                result["actions"].append({
-                                    "type": "SKIP",
-                                    "file": file1_info["path"],
-                                })
-                        else:
-                            # Non-interactive mode - mark as conflict
-                            result["conflicts"] += 1
-                            result["actions"].append({
-                                "type": "CONFLICT",
-                                "file": file1_info["path"],
-                                "vault1": vault1_path.name,
-                                "vault2": vault2_path.name,
-                            })
-        
-        # After all syncing is done, rebuild indices to get fresh digests
-        build_index(vault1_path, rebuild=False, auto_fix=True)
-        build_index(vault2_path, rebuild=False, auto_fix=True)
-        
-        # Reload indices with fresh digests
-        with open(vault1_path / ".cast" / "index.json") as f:
-            vault1_fresh = json.load(f)
-        with open(vault2_path / ".cast" / "index.json") as f:
-            vault2_fresh = json.load(f)
+                    # Non-interactive mode - mark as conflict
+                    result["conflicts"] += 1
+                    result["actions"].append({
+                        "type": "CONFLICT",
+                        "file": file1_info["path"],
+                        "cast_id": cast_id,
+                        "vault1": vault1_path.name,
+                        "vault2": vault2_path.name,
+                    })
         
-        # Now update sync states with fresh digests
-        for cast_id in all_ids:
-            # Skip files that had unresolved conflicts
-            skip_action = any(
-                a.get("type") == "SKIP" and 
-                (vault1_fresh.get(cast_id, {}).get("path") == a.get("file") or
-                 vault2_fresh.get(cast_id, {}).get("path") == a.get("file"))
-                for a in result["actions"]
-            )
-            conflict_action = any(
-                a.get("type") == "CONFLICT" and
-                (vault1_fresh.get(cast_id, {}).get("path") == a.get("file") or
-                 vault2_fresh.get(cast_id, {}).get("path") == a.get("file"))
-                for a in result["actions"]
+        # Apply every automatic decision before prompting
+        self._copy_files([(src, dst) for _, src, dst in copies])
+        
+        chosen: list[tuple[str, Path, Path]] = []
+        for cast_id, file1_path, file2_path in pending_conflicts:
+            choice = self._resolve_conflict_interactive(
+                cast_id,
+                file1_path,
+                file2_path,
+                vault1_path.name,
+                vault2_path.name,
             )
             
-            if not skip_action and not conflict_action:
+            if choice == "1":
+                chosen.append((cast_id, file1_path, file2_path))
+                result["synced"] += 1
+                result["actions"].append({
+                    "type": "USE_VAULT1",
+                    "file": vault1_index[cast_id]["path"],
+                })
+            elif choice == "2":
+                chosen.append((cast_id, file2_path, file1_path))
+                result["synced"] += 1
+                result["actions"].append({
+                    "type": "USE_VAULT2",
+                    "file": vault2_index[cast_id]["path"],
+                })
+            else:
+                result["conflicts"] += 1
+                result["actions"].append({
+                    "type": "SKIP",
+                    "file": vault1_index[cast_id]["path"],
+                    "cast_id": cast_id,
+                })
+        
+        self._copy_files([(src, dst) for _, src, dst in chosen])
+        copies.extend(chosen)
+        
+        # copy2 keeps content, size and mtime, so each copied file's index entry
+        # is the source's entry at the destination path - no need to re-hash it
+        touched1 = {}
+        touched2 = {}
+        for cast_id, _src, dst in copies:
+            if dst.is_relative_to(vault1_path):
+                touched1[dst] = {cast_id: _moved_entry(vault2_index[cast_id], dst, vault1_path)}
+            else:
+                touched2[dst] = {cast_id: _moved_entry(vault1_index[cast_id], dst, vault2_path)}
+        
+        # The indices are updated in place, so later peers see what this pair
+        # pulled into vault1 - otherwise their stale copy would auto-merge over it
+        vault1_fresh = update_index(
+            vault1_path, list(touched1), config=vault1_config, index_data=vault1_index, entries=touched1,
+        )
+        vault2_fresh = update_index(
+            vault2_path, list(touched2), config=vault2_config, index_data=vault2_index, entries=touched2,
+        )
+        
+        # Files that had unresolved conflicts keep their old baseline
+        unresolved_ids = {
+            a["cast_id"] for a in result["actions"] if a["type"] in ("SKIP", "CONFLICT")
+        }
+        
+        # Now update sync states with fresh digests
+        for cast_id in all_ids:
+            if cast_id not in unresolved_ids:
                 # Get the fresh digest (should be same in both vaults after sync)
                 digest = None
                 if cast_id in vault1_fresh:
@@ -380,8 +558,14 @@ class SimpleSyncEngine:
                     sync_state1.set_last_sync_digest(vault2_config.vault_id, cast_id, digest)
                     sync_state2.set_last_sync_digest(vault1_config.vault_id, cast_id, digest)
         
-        # Save sync states
-        sync_state1.save()
+        # Remember the converged state so an unchanged pair can be skipped
+        # next time (overpower leaves vault2-only files behind, so it never counts)
+        if not overpower and not result["conflicts"]:
+            pair_root = _pair_root(vault1_fresh, vault2_fresh)
+            sync_state1.set_last_sync_root(vault2_config.vault_id, pair_root)
+            sync_state2.set_last_sync_root(vault1_config.vault_id, pair_root)
+        
+        # Save peer sync state; sync_all saves vault1's right after this pair returns
         sync_state2.save()
         
         return result
@@ -417,24 +601,38 @@ class SimpleSyncEngine:
             return False
         
         # Extract vault names from cast_vaults (format: "vault_name (role)")
-        vault_names = set()
-        for vault_entry in cast_vaults:
-            if isinstance(vault_entry, str):
-                # Extract vault name before parentheses
-                vault_name = vault_entry.split("(")[0].strip()
-                vault_names.add(vault_name)
+        try:
+            vault_names = _cast_vault_names(tuple(cast_vaults))
+        except TypeError:
+            # Unhashable entries (e.g. nested mappings) can't be cached
+            vault_names = _cast_vault_names.__wrapped__(cast_vaults)
         
         # Both vaults must be in the cast_vaults list for sync
         return vault1_id in vault_names and vault2_id in vault_names
     
+    def _copy_files(self, copies: list[tuple[Path, Path]]) -> None:
+        """Copy files concurrently.
+        
+        Every copy targets a different file, so they are independent and
+        the I/O can overlap on a bounded thread pool.
+        """
+        if len(copies) < 2:
+            for src, dst in copies:
+                self._copy_file(src, dst)
+            return
+        
+        max_workers = min(16, (os.cpu_count() or 1) * 2, len(copies))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the results so the first failed copy is re-raised
+            list(executor.map(lambda pair: self._copy_file(*pair), copies))
+    
     def _copy_file(self, src: Path, dst: Path) -> None:
         """Copy file reliably."""
         dst.parent.mkdir(parents=True, exist_ok=True)
         
-        # Copy to temp file first for atomicity
-        temp_file = dst.with_suffix(".tmp")
-        shutil.copy2(src, temp_file)
-        temp_file.replace(dst)
+        # Copy to a temp file first for atomicity
+        with atomic_replace(dst) as (_, temp_path):
+            shutil.copy2(src, temp_path)
     
     def _resolve_conflict_interactive(
         self,
@@ -449,20 +647,13 @@ class SimpleSyncEngine:
         Returns:
             "1" for vault1, "2" for vault2, "s" for skip
         """
-        from rich.console import Console
-        from rich.panel import Panel
-        from rich.columns import Columns
-        
-        console = Console()
-        
-        # Read both versions
-        content1 = file1.read_text()
-        content2 = file2.read_text()
+        if self._console is None:
+            self._console = Console()
+        console = self._console
         
-        # Extract just the body for display using our new md module
-        from cast.md import split_frontmatter
-        _, _, body1 = split_frontmatter(content1)
-        _, _, body2 = split_frontmatter(content2)
+        # Read just enough of both versions to show their bodies
+        body1 = _read_preview_body(file1)
+        body2 = _read_preview_body(file2)
         
         # Show both versions
         console.print(f"\n[yellow]Conflict in file:[/yellow] {file1.name}")
@@ -470,12 +661,12 @@ class SimpleSyncEngine:
         
         # Display side by side
         panel1 = Panel(
-            body1[:500] + ("..." if len(body1) > 500 else ""),
+            body1[:CONFLICT_PREVIEW_CHARS] + ("..." if len(body1) > CONFLICT_PREVIEW_CHARS else ""),
             title=f"[cyan]{vault1_name}[/cyan]",
             border_style="cyan",
         )
         panel2 = Panel(
-            body2[:500] + ("..." if len(body2) > 500 else ""),
+            body2[:CONFLICT_PREVIEW_CHARS] + ("..." if len(body2) > CONFLICT_PREVIEW_CHARS else ""),
             title=f"[green]{vault2_name}[/green]",
             border_style="green",
         )
@@ -1,11 +1,37 @@
 """Utility functions for Cast."""
 
+import contextlib
+import functools
+import json
 import logging
+import os
+import stat
 import sys
+import tempfile
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any
 
+import yaml
 from rich.logging import RichHandler
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, stdlib json is used otherwise
+    orjson = None
+
+# libyaml's C parser and emitter when PyYAML was built with it. Same
+# results as SafeLoader; the emitter only folds long scalars differently
+try:
+    from yaml import CSafeDumper as YamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeDumper as YamlDumper  # noqa: F401 - used by cast.ids and cast.config
+    from yaml import SafeLoader as YamlLoader
+
+# fdatasync skips the metadata flush where available (not on macOS/Windows)
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
 
 def setup_logging(verbose: bool = False, quiet: bool = False) -> None:
     """Configure logging for the application."""
@@ -84,27 +110,120 @@ def is_binary_file(path: Path) -> bool:
         return True
 
 
+@functools.cache
+def _umask() -> int:
+    """Get the process umask, for the permissions of newly created files.
+    
+    os.umask can only be queried by setting it, so this is done once and
+    only when a new file is first created. The brief placeholder is the
+    most restrictive mask, so files other threads create meanwhile are
+    never more open than intended.
+    """
+    umask = os.umask(0o077)
+    os.umask(umask)
+    return umask
+
+
+@contextlib.contextmanager
+def atomic_replace(path: Path) -> Iterator[tuple[int, Path]]:
+    """Stage a file next to path and rename it over path on success.
+    
+    Yields the open descriptor and path of a uniquely named hidden temp
+    file in the target's directory, so concurrent writers and leftovers
+    from a crashed run never collide. The descriptor is closed before the
+    rename; on error the temp file is removed and the target is untouched.
+    
+    Args:
+        path: Target file path
+    """
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    temp_path = Path(temp_name)
+    try:
+        try:
+            yield fd, temp_path
+        finally:
+            os.close(fd)
+        temp_path.replace(path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            temp_path.unlink()
+        raise
+
+
 def atomic_write(path: Path, content: str | bytes, mode: str = "w") -> None:
     """Write file atomically using temp file and rename.
     
+    Content is encoded once, written to a temp file next to the target
+    and flushed to disk before the rename, so a crash can never leave a
+    truncated file in place of the original. The existing file's
+    permissions are kept, and a symlinked target is replaced behind the
+    link rather than the link itself.
+    
     Args:
         path: Target file path
         content: Content to write
         mode: File open mode ('w' for text, 'wb' for binary)
     """
-    temp_path = path.with_suffix(".tmp")
+    data = content if mode == "wb" else content.encode("utf-8")
+    path = Path(path).resolve()
     
     try:
-        if mode == "wb":
-            temp_path.write_bytes(content)
-        else:
-            temp_path.write_text(content, encoding="utf-8")
+        file_mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        file_mode = 0o666 & ~_umask()
+    
+    with atomic_replace(path) as (fd, temp_path):
+        temp_path.chmod(file_mode)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        _fdatasync(fd)
+
+
+def yaml_safe_load(data: str | bytes) -> Any:
+    """Parse YAML with the safe loader (libyaml's when available).
+    
+    Args:
+        data: YAML document
         
-        # Atomic rename
-        temp_path.replace(path)
+    Returns:
+        Plain Python data; YAML tags that would build arbitrary objects are rejected
+    """
+    # YamlLoader is always CSafeLoader or SafeLoader
+    return yaml.load(data, Loader=YamlLoader)  # noqa: S506
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed.
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+        sort_keys: Sort object keys
         
-    except Exception:
-        # Clean up temp file on error
-        if temp_path.exists():
-            temp_path.unlink()
-        raise
\ No newline at end of file
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        # Non-string keys (e.g. YAML "1: x" in frontmatter) become strings as with json
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # Beyond orjson, e.g. integers wider than 64 bits
+            pass
+    
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
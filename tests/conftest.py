@@ -0,0 +1,29 @@
+"""Shared test fixtures."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from cast.config import VaultConfig
+
+
+@pytest.fixture
+def make_vault(tmp_path: Path) -> Callable[..., Path]:
+    """Factory creating initialized vaults under tmp_path.
+    
+    Call it with a vault ID and the files to create ({relative path: content});
+    it returns the vault's root, named after the ID.
+    """
+    def make(vault_id: str, files: dict[str, str] | None = None) -> Path:
+        vault_path = tmp_path / vault_id
+        VaultConfig.create_default(vault_path, vault_id).save()
+        
+        for file_path, content in (files or {}).items():
+            full_path = vault_path / file_path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(content)
+        
+        return vault_path
+    
+    return make
@@ -0,0 +1,18 @@
+"""Tests for configuration management."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from cast.config import GlobalConfig
+
+
+def test_global_config_update_keeps_concurrent_changes(tmp_path, monkeypatch):
+    """Test concurrent registrations through update() are all kept."""
+    monkeypatch.setattr("cast.config.platformdirs.user_config_dir", lambda *_args: str(tmp_path))
+    
+    def register(i):
+        GlobalConfig.update(lambda config: config.register_vault(f"vault{i}", f"/vaults/{i}"))
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(register, range(16)))
+    
+    assert GlobalConfig.load().vaults == {f"vault{i}": f"/vaults/{i}" for i in range(16)}
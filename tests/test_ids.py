@@ -7,6 +7,7 @@ import pytest
 
 from cast.ids import (
     add_cast_id_to_file,
+    ensure_cast_id_first,
     extract_frontmatter,
     generate_cast_id,
     get_cast_id,
@@ -58,6 +59,18 @@ Body content"""
     assert body2 == "Just body content"
 
 
+def test_extract_frontmatter_returns_fresh_dicts():
+    """Test repeated parses of the same frontmatter don't share mutable state."""
+    content = "---\ncast-vaults:\n  - vault1 (sync)\n---\nBody"
+    
+    fm_dict, _, _ = extract_frontmatter(content)
+    fm_dict["cast-vaults"].append("vault2 (sync)")
+    fm_dict["cast-id"] = "changed"
+    
+    fm_dict2, _, _ = extract_frontmatter(content)
+    assert fm_dict2 == {"cast-vaults": ["vault1 (sync)"]}
+
+
 def test_inject_cast_id():
     """Test cast-id injection."""
     # Content without frontmatter
@@ -80,6 +93,44 @@ Body content"""
     assert "title: Test" in result2
 
 
+def test_inject_cast_id_keeps_frontmatter_text():
+    """Test a missing cast-id is added without re-formatting the rest of the frontmatter."""
+    new_id = generate_cast_id()
+    content = "---\ncast-type: note\ncast-vaults:\n  - vault1 (sync)  # home\ntitle: 'Test'\n---\nBody"
+    
+    result = inject_cast_id(content, new_id)
+    assert result == f"---\ncast-id: {new_id}\n" + content[4:]
+    
+    # Keys that also need reordering still go through the YAML dump
+    result2 = inject_cast_id("---\ntitle: Test\ncast-type: note\n---\nBody", new_id)
+    assert result2 == f"---\ncast-id: {new_id}\ncast-type: note\ntitle: Test\n---\nBody"
+
+
+def test_ensure_cast_id_first():
+    """Test cast-id reordering only rewrites out-of-order frontmatter."""
+    # Out of order - cast-id is moved to the front
+    content = """---
+title: Test
+cast-id: f47ac10b-58cc-4372-a567-0e02b2c3d479
+---
+Body content"""
+    
+    result = ensure_cast_id_first(content)
+    assert result.startswith("---\ncast-id: f47ac10b-58cc-4372-a567-0e02b2c3d479\n")
+    assert result.endswith("Body content")
+    
+    # Already ordered - original formatting is preserved untouched
+    content2 = """---
+cast-id: f47ac10b-58cc-4372-a567-0e02b2c3d479
+cast-vaults:
+  - vault1 (sync)
+title: Test
+---
+Body content"""
+    
+    assert ensure_cast_id_first(content2) is content2
+
+
 def test_get_cast_id():
     """Test cast-id extraction from file."""
     with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as f:
@@ -0,0 +1,205 @@
+"""Tests for vault indexing."""
+
+import glob
+from pathlib import Path
+
+from cast.config import VaultConfig
+from cast.ids import get_cast_id
+from cast.index import _exclude_matcher, _iter_markdown_files, build_index, update_index, validate_index
+from cast.util import atomic_write
+
+
+def test_build_index_adds_cast_id(make_vault):
+    """Test files with cast metadata get a cast-id and an index entry."""
+    vault = make_vault("vault1", {
+        "01 Vault/note.md": "---\ntitle: Note\ncast-vaults:\n- vault1 (sync)\n---\nBody\n",
+        "01 Vault/plain.md": "Just a plain note\n",
+    })
+    
+    index_data = build_index(vault, auto_fix=True)
+    
+    cast_id = get_cast_id(vault / "01 Vault" / "note.md")
+    assert cast_id is not None
+    assert list(index_data) == [cast_id]
+    assert index_data[cast_id]["path"] == str(Path("01 Vault") / "note.md")
+    assert index_data[cast_id]["cast_vaults"] == ["vault1 (sync)"]
+    assert (vault / "01 Vault" / "note.md").read_text().startswith(f"---\ncast-id: {cast_id}\n")
+
+
+def test_validate_index(make_vault):
+    """Test validation reports files whose body changed after indexing."""
+    vault = make_vault("vault1", {
+        "01 Vault/note.md": "---\ncast-vaults:\n- vault1 (sync)\n---\nBody\n",
+    })
+    build_index(vault, auto_fix=True)
+    
+    assert validate_index(vault) == []
+    
+    note = vault / "01 Vault" / "note.md"
+    note.write_text(note.read_text().replace("Body", "Changed body"))
+    
+    issues = validate_index(vault)
+    assert [issue["type"] for issue in issues] == ["digest_mismatch"]
+
+
+def test_update_index_only_touched_files(make_vault):
+    """Test update_index refreshes the given files and leaves the rest alone."""
+    vault = make_vault("vault1", {
+        "01 Vault/a.md": "---\ncast-vaults:\n- vault1 (sync)\n---\nA\n",
+        "01 Vault/b.md": "---\ncast-vaults:\n- vault1 (sync)\n---\nB\n",
+    })
+    before = build_index(vault, auto_fix=True)
+    id_a = get_cast_id(vault / "01 Vault" / "a.md")
+    id_b = get_cast_id(vault / "01 Vault" / "b.md")
+    
+    for name in ("a.md", "b.md"):
+        note = vault / "01 Vault" / name
+        note.write_text(note.read_text() + "Changed\n")
+    
+    after = update_index(vault, [vault / "01 Vault" / "a.md"])
+    
+    assert after[id_a]["digest"] != before[id_a]["digest"]
+    assert after[id_b] == before[id_b]
+    
+    # A deleted file loses its entry
+    (vault / "01 Vault" / "a.md").unlink()
+    after = update_index(vault, [vault / "01 Vault" / "a.md"])
+    assert list(after) == [id_b]
+
+
+def test_build_index_skips_unchanged_files(make_vault, monkeypatch):
+    """Test files whose mtime and size are unchanged are not re-read."""
+    vault = make_vault("vault1", {
+        "01 Vault/note.md": "---\ncast-vaults:\n- vault1 (sync)\n---\nBody\n",
+    })
+    first = build_index(vault, auto_fix=True)
+    
+    def fail_index_file(*_args, **_kwargs):
+        raise AssertionError("unchanged file should not be re-indexed")
+    
+    monkeypatch.setattr("cast.index.index_file", fail_index_file)
+    assert build_index(vault) == first
+
+
+def test_build_index_redigests_on_algorithm_change(make_vault, monkeypatch):
+    """Test switching the digest algorithm re-digests otherwise unchanged files."""
+    vault = make_vault("vault1", {
+        "01 Vault/note.md": "---\ncast-vaults:\n- vault1 (sync)\n---\nBody\n",
+    })
+    cast_id, entry = next(iter(build_index(vault, auto_fix=True).items()))
+    assert entry["digest"].startswith("sha256:")
+    
+    monkeypatch.setattr("cast.md.DIGEST_ALGORITHM", "blake2b")
+    
+    assert build_index(vault)[cast_id]["digest"].startswith("blake2b:")
+    assert validate_index(vault) == []
+
+
+def test_build_index_process_pool(make_vault, monkeypatch):
+    """Test indexing across worker processes matches indexing in-process."""
+    vault = make_vault("vault1", {
+        f"01 Vault/note{i}.md": f"---\ncast-vaults:\n- vault1 (sync)\n---\nBody {i}\n"
+        for i in range(3)
+    })
+    serial = build_index(vault, auto_fix=True)
+    
+    monkeypatch.setattr("cast.index._PARALLEL_INDEX_MIN_FILES", 1)
+    
+    assert build_index(vault, rebuild=True) == serial
+
+
+def test_build_index_parses_config_once(make_vault, monkeypatch):
+    """Test repeated builds reuse the vault config until config.yaml changes."""
+    vault = make_vault("vault1", {
+        "01 Vault/note.md": "---\ncast-vaults:\n- vault1 (sync)\n---\nBody\n",
+    })
+    loads = []
+    original_load = VaultConfig.load.__func__
+    
+    def counting_load(cls, vault_root):
+        loads.append(vault_root)
+        return original_load(cls, vault_root)
+    
+    monkeypatch.setattr(VaultConfig, "load", classmethod(counting_load))
+    
+    build_index(vault, auto_fix=True)
+    build_index(vault)
+    update_index(vault, [])
+    assert len(loads) == 1
+    
+    config = VaultConfig.create_default(vault, "renamed")
+    config.save()
+    
+    build_index(vault)
+    assert len(loads) == 2
+
+
+def test_scandir_walk_matches_glob(make_vault):
+    """Test the scandir walk finds the same files, in the same order, as glob."""
+    vault = make_vault("vault1", {
+        "01 Vault/a.md": "A",
+        "01 Vault/b.txt": "B",
+        "01 Vault/.hidden.md": "H",
+        "01 Vault/.obsidian/c.md": "C",
+        "01 Vault/sub/d.md": "D",
+        "01 Vault/sub/deeper/e.md": "E",
+        "01 Vault/sub2/f.md": "F",
+        "02 Other/g.md": "G",
+    })
+    (vault / "01 Vault" / "dir.md").mkdir()
+    config = VaultConfig.load(vault)
+    
+    walked = [path for path, _ in _iter_markdown_files(vault, config)]
+    
+    # glob.glob on purpose: it is the behaviour the walk reproduces (Path.glob differs on hidden files)
+    matches = glob.glob(str(vault / "01 Vault/**/*.md"), recursive=True)  # noqa: PTH207
+    expected = [Path(p) for p in matches if Path(p).is_file()]
+    assert walked == expected
+    assert len(walked) == 4
+
+
+def test_build_index_rewrites_only_out_of_order_frontmatter(make_vault, monkeypatch):
+    """Test frontmatter already in order is left alone and out-of-order frontmatter is fixed."""
+    cast_id = "f47ac10b-58cc-4372-a567-0e02b2c3d479"
+    other_id = "0b9a3f7e-2c1d-4e5f-8a6b-7c8d9e0f1a2b"
+    ordered = f"---\ncast-id: {cast_id}\ncast-vaults: [vault1 (sync)]\n---\nBody\n"
+    vault = make_vault("vault1", {
+        "01 Vault/ordered.md": ordered,
+        "01 Vault/unordered.md": f"---\ntitle: Note\ncast-id: {other_id}\n---\nBody\n",
+    })
+    
+    writes = []
+    
+    def recording_write(path, *args, **kwargs):
+        writes.append(path.name)
+        atomic_write(path, *args, **kwargs)
+    
+    monkeypatch.setattr("cast.index.atomic_write", recording_write)
+    
+    build_index(vault)
+    
+    assert writes == ["unordered.md", "index.json"]
+
+
+def test_exclude_matcher_matches_path_match():
+    """Test the compiled exclude check agrees with Path.match."""
+    patterns = (".cast/**", "00 Software/**", "*.tmp.md", "dra?t/*", "[ab]/*.md", "/abs/*.md")
+    is_excluded = _exclude_matcher(patterns)
+    
+    for path in (
+        "/v/.cast/x.md", "/v/00 Software/x.md", "/v/00 Software/sub/x.md", "/v/01 Vault/n.tmp.md",
+        "/v/draft/x.md", "/v/drafts/x.md", "/v/a/x.md", "/v/c/x.md", "/abs/x.md", "rel/00 Software/x.md",
+    ):
+        assert is_excluded(Path(path)) == any(Path(path).match(p) for p in patterns), path
+    
+    # Patterns as deep as the path itself: wildcards never match the root
+    # (Python 3.13 Path.match; 3.11 still let "*" and "?" match "/")
+    for pattern, path, expected in (
+        ("*/x.md", "/x.md", False),
+        ("*/v/x.md", "/v/x.md", False),
+        ("?/v/x.md", "/v/x.md", False),
+        ("v/x.md", "/v/x.md", True),
+        ("*/x.md", "v/x.md", True),
+        ("*/x.md", "x.md", False),
+    ):
+        assert _exclude_matcher((pattern,))(Path(path)) is expected, (pattern, path)
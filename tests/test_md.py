@@ -0,0 +1,57 @@
+"""Tests for markdown and frontmatter parsing."""
+
+import pytest
+import yaml
+
+from cast.md import _check_digest_algorithm, parse_frontmatter_yaml, split_frontmatter
+
+
+@pytest.mark.parametrize("fm_text", [
+    # Handled without the YAML parser
+    "cast-id: f47ac10b-58cc-4372-a567-0e02b2c3d479\ncast-version: 1\n"
+    "cast-vaults:\n  - vault1 (sync)\n  - vault2 (cache)",
+    "title: Note\ntags:\n- a\n- b\nempty:",
+    # Values YAML reads as something other than a plain string
+    "cast-version: 1.0\npublished: true\ncreated: 2024-01-01\nnothing: null",
+    "yes: no\ncount: 007\ntime: 1:20",
+    # Syntax the fast path leaves to YAML
+    "title: 'Quoted: text'\ntags: [a, b]\nnested:\n  key: value  # comment",
+])
+def test_parse_frontmatter_yaml_matches_yaml(fm_text):
+    """Test frontmatter parsing gives exactly what the YAML parser gives."""
+    expected = yaml.safe_load(fm_text)
+    result = parse_frontmatter_yaml(fm_text)
+    
+    assert result == expected
+    assert list(result) == list(expected)
+    assert [type(v) for v in result.values()] == [type(v) for v in expected.values()]
+
+
+UNTERMINATED = "---\ntitle: Note\nBody without a closing delimiter\n"
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("---\ntitle: Note\n---\nBody\n", ({"title": "Note"}, "title: Note", "Body\n")),
+    ("---\r\ntitle: Note\r\n---\r\nBody\r\n", ({"title": "Note"}, "title: Note", "Body\n")),
+    ("Just a body\n", (None, "", "Just a body\n")),
+    (UNTERMINATED, (None, "", UNTERMINATED)),
+    ("---\ntitle: [unclosed\n---\nBody", (None, "title: [unclosed", "Body")),
+    ("---\n- a list\n---\nBody", (None, "- a list", "Body")),
+    ("---\ntitle: Note\n---\nBody\n---\nMore", ({"title": "Note"}, "title: Note", "Body\n---\nMore")),
+])
+def test_split_frontmatter(content, expected):
+    """Test splitting content into frontmatter dict, frontmatter text and body."""
+    assert split_frontmatter(content) == expected
+
+
+@pytest.mark.parametrize("name", ["sha256", "sha512", "md5"])
+def test_check_digest_algorithm_accepts_fixed_length(name):
+    """Test fixed-length hashlib algorithms are accepted as CAST_DIGEST."""
+    assert _check_digest_algorithm(name) == name
+
+
+@pytest.mark.parametrize("name", ["sha265", "shake_128", "shake_256", ""])
+def test_check_digest_algorithm_rejects_unknown(name):
+    """Test a bad CAST_DIGEST fails up front with an error naming the variable."""
+    with pytest.raises(ValueError, match="CAST_DIGEST"):
+        _check_digest_algorithm(name)
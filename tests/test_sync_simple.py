@@ -0,0 +1,234 @@
+"""Tests for the simple sync engine."""
+
+from pathlib import Path
+
+import pytest
+
+from cast.config import GlobalConfig
+from cast.index import build_index
+from cast.sync_simple import SimpleSyncEngine, SyncState, _read_preview_body
+
+SHARED_NOTE = """---
+cast-vaults:
+  - vault1 (sync)
+  - vault2 (sync)
+  - vault3 (sync)
+---
+Original body
+"""
+
+
+def edit_note(path: Path, old: str, new: str) -> None:
+    """Replace text in a note in place, with a single open of the file."""
+    with path.open("r+", encoding="utf-8") as f:
+        content = f.read().replace(old, new)
+        f.seek(0)
+        f.write(content)
+        f.truncate()
+
+
+def make_engine(*vaults: Path) -> SimpleSyncEngine:
+    """Create a sync engine that only knows about the given vaults."""
+    return SimpleSyncEngine(GlobalConfig(vaults={v.name: str(v) for v in vaults}))
+
+
+def test_pull_reaches_later_peers(make_vault):
+    """Test a change pulled from one peer is pushed on to the next peer."""
+    vault1 = make_vault("vault1", {"01 Vault/note.md": SHARED_NOTE})
+    vault2 = make_vault("vault2")
+    vault3 = make_vault("vault3")
+    engine = make_engine(vault1, vault2, vault3)
+    
+    engine.sync_all(vault1, interactive=False)
+    
+    edit_note(vault2 / "01 Vault" / "note.md", "Original body", "Edited in vault2")
+    
+    result = engine.sync_all(vault1, interactive=False)
+    
+    assert result["conflicts"] == 0
+    assert "Edited in vault2" in (vault1 / "01 Vault" / "note.md").read_text()
+    assert "Edited in vault2" in (vault3 / "01 Vault" / "note.md").read_text()
+    
+    # A second run must not bring the old body back from vault3
+    result = engine.sync_all(vault1, interactive=False)
+    
+    assert result["synced"] == 0
+    assert "Edited in vault2" in (vault1 / "01 Vault" / "note.md").read_text()
+
+
+def test_concurrent_peer_edits_conflict(make_vault):
+    """Test two peers editing the same note is reported instead of overwritten."""
+    vault1 = make_vault("vault1", {"01 Vault/note.md": SHARED_NOTE})
+    vault2 = make_vault("vault2")
+    vault3 = make_vault("vault3")
+    engine = make_engine(vault1, vault2, vault3)
+    
+    engine.sync_all(vault1, interactive=False)
+    
+    for vault in (vault2, vault3):
+        edit_note(vault / "01 Vault" / "note.md", "Original body", f"Edited in {vault.name}")
+    
+    result = engine.sync_all(vault1, interactive=False)
+    
+    assert result["conflicts"] == 1
+    assert "Edited in vault3" in (vault3 / "01 Vault" / "note.md").read_text()
+
+
+def test_unchanged_pair_is_skipped(make_vault, monkeypatch):
+    """Test a peer is skipped when neither side changed since the last clean sync."""
+    vault1 = make_vault("vault1", {"01 Vault/note.md": SHARED_NOTE})
+    vault2 = make_vault("vault2")
+    engine = make_engine(vault1, vault2)
+    
+    engine.sync_all(vault1, interactive=False)
+    
+    def fail_pair(*_args, **_kwargs):
+        raise AssertionError("unchanged pair should be skipped")
+    
+    monkeypatch.setattr(engine, "_sync_vault_pair", fail_pair)
+    result = engine.sync_all(vault1, interactive=False)
+    monkeypatch.undo()
+    
+    assert result["vaults"]["vault2"]["synced"] == 0
+    
+    # Sharing a local note with vault2 changes the root and syncs again
+    (vault1 / "01 Vault" / "local.md").write_text("---\ncast-vaults:\n  - vault1 (sync)\n---\nLocal\n")
+    engine.sync_all(vault1, interactive=False)
+    edit_note(vault1 / "01 Vault" / "local.md", "- vault1 (sync)\n", "- vault1 (sync)\n  - vault2 (sync)\n")
+    
+    result = engine.sync_all(vault1, interactive=False)
+    assert result["vaults"]["vault2"]["synced"] == 1
+    assert (vault2 / "01 Vault" / "local.md").exists()
+
+
+def test_relative_current_vault_is_not_its_own_peer(make_vault, tmp_path, monkeypatch):
+    """Test a vault given by relative path is matched to its registered absolute path."""
+    vault1 = make_vault("vault1", {"01 Vault/note.md": SHARED_NOTE})
+    vault2 = make_vault("vault2")
+    engine = make_engine(vault1, vault2)
+    
+    monkeypatch.chdir(tmp_path)
+    result = engine.sync_all(Path("vault1"), interactive=False)
+    
+    assert list(result["vaults"]) == ["vault2"]
+    assert (vault2 / "01 Vault" / "note.md").exists()
+
+
+def test_interactive_prompt_after_automatic_copies(make_vault, monkeypatch):
+    """Test conflicts are prompted for after automatic copies and the choice is applied."""
+    vault1 = make_vault("vault1", {
+        "01 Vault/auto.md": SHARED_NOTE,
+        "01 Vault/conflict.md": SHARED_NOTE,
+    })
+    vault2 = make_vault("vault2")
+    engine = make_engine(vault1, vault2)
+    
+    engine.sync_all(vault1, interactive=False)
+    
+    for name, vaults in (("auto.md", [vault2]), ("conflict.md", [vault1, vault2])):
+        for vault in vaults:
+            edit_note(vault / "01 Vault" / name, "Original body", f"Edited in {vault.name}")
+    
+    def choose_vault2(_cast_id, file1, _file2, _vault1_name, _vault2_name):
+        assert file1.name == "conflict.md"
+        assert "Edited in vault2" in (vault1 / "01 Vault" / "auto.md").read_text()
+        return "2"
+    
+    monkeypatch.setattr(engine, "_resolve_conflict_interactive", choose_vault2)
+    result = engine.sync_all(vault1, interactive=True)
+    
+    assert result["synced"] == 2
+    assert result["conflicts"] == 0
+    assert "Edited in vault2" in (vault1 / "01 Vault" / "conflict.md").read_text()
+
+
+def test_vaults_share_index_worker_budget(make_vault, monkeypatch):
+    """Test concurrent vault indexing splits the worker processes between vaults."""
+    vaults = [make_vault(f"vault{i}") for i in range(1, 4)]
+    engine = make_engine(*vaults)
+    
+    budgets = []
+    original_build_index = build_index
+    
+    def recording_build_index(*args, max_workers=None, **kwargs):
+        budgets.append(max_workers)
+        return original_build_index(*args, max_workers=max_workers, **kwargs)
+    
+    monkeypatch.setattr("cast.sync_simple.INDEX_WORKERS", 8)
+    monkeypatch.setattr("cast.sync_simple.build_index", recording_build_index)
+    engine.sync_all(vaults[0], interactive=False)
+    
+    assert budgets == [2, 2, 2]
+
+
+def test_sync_state_roots_do_not_collide_with_vault_ids(tmp_path):
+    """Test a vault named like the roots section keeps its digests and root apart."""
+    state = SyncState(tmp_path)
+    state.set_last_sync_digest("_roots", "cast-id", "sha256:body")
+    state.set_last_sync_root("_roots", "sha256:root")
+    state.save()
+    
+    state = SyncState(tmp_path)
+    assert state.get_last_sync_digest("_roots", "cast-id") == "sha256:body"
+    assert state.get_last_sync_root("_roots") == "sha256:root"
+
+
+def test_sync_state_loads_legacy_layout(tmp_path):
+    """Test an unversioned state file keeps its peer digests."""
+    (tmp_path / ".cast").mkdir()
+    (tmp_path / ".cast" / "sync_state.json").write_text('{"vault2": {"cast-id": "sha256:body"}}')
+    
+    state = SyncState(tmp_path)
+    assert state.get_last_sync_digest("vault2", "cast-id") == "sha256:body"
+    assert state.get_last_sync_root("vault2") is None
+
+
+def test_interrupted_sync_keeps_current_baselines(make_vault, monkeypatch):
+    """Test pairs finished before a failure keep baselines on both sides."""
+    vault1 = make_vault("vault1", {"01 Vault/note.md": SHARED_NOTE})
+    vault2 = make_vault("vault2")
+    vault3 = make_vault("vault3")
+    engine = make_engine(vault1, vault2, vault3)
+    
+    sync_vault_pair = engine._sync_vault_pair
+    calls = []
+    
+    def failing_second_pair(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        return sync_vault_pair(*args, **kwargs)
+    
+    monkeypatch.setattr(engine, "_sync_vault_pair", failing_second_pair)
+    with pytest.raises(RuntimeError):
+        engine.sync_all(vault1, interactive=False)
+    
+    synced_peer = calls[0][4]
+    peer_baselines = SyncState(synced_peer).state["vault1"]
+    
+    assert peer_baselines
+    assert SyncState(vault1).state[synced_peer.name] == peer_baselines
+
+
+def test_unusable_registered_vaults_are_skipped(make_vault, tmp_path):
+    """Test registered vault paths that are gone or now a file don't abort the sync."""
+    vault1 = make_vault("vault1", {"01 Vault/note.md": SHARED_NOTE})
+    vault2 = make_vault("vault2")
+    not_a_dir = tmp_path / "vault3"
+    not_a_dir.write_text("not a vault")
+    engine = make_engine(vault1, vault2, not_a_dir, tmp_path / "missing")
+    
+    result = engine.sync_all(vault1, interactive=False)
+    
+    assert list(result["vaults"]) == ["vault2"]
+    assert (vault2 / "01 Vault" / "note.md").exists()
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_read_preview_body_past_long_frontmatter(tmp_path, newline):
+    """Test frontmatter longer than the preview window is never shown as the body."""
+    frontmatter = "".join(f"key{i}: value {i}{newline}" for i in range(1000))
+    note = tmp_path / "note.md"
+    note.write_bytes(f"---{newline}{frontmatter}---{newline}The body{newline}".encode())
+    
+    assert _read_preview_body(note) == "The body\n"
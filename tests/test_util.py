@@ -0,0 +1,64 @@
+"""Tests for utility functions."""
+
+import json
+import os
+import stat
+
+from cast.util import atomic_write, json_dumps, json_loads
+
+
+def test_atomic_write_keeps_mode(tmp_path):
+    """Test rewriting a file keeps its permissions."""
+    note = tmp_path / "note.md"
+    note.write_text("old")
+    note.chmod(0o600)
+    
+    atomic_write(note, "new")
+    
+    assert note.read_text() == "new"
+    assert stat.S_IMODE(note.stat().st_mode) == 0o600
+
+
+def test_atomic_write_leaves_sibling_tmp_file(tmp_path):
+    """Test a user file named like the old temp file is not touched."""
+    note = tmp_path / "note.md"
+    note.write_text("old")
+    sibling = tmp_path / "note.tmp"
+    sibling.write_text("user data")
+    
+    atomic_write(note, "new")
+    
+    assert sibling.read_text() == "user data"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["note.md", "note.tmp"]
+
+
+def test_atomic_write_through_symlink(tmp_path):
+    """Test a symlinked file is rewritten behind the link."""
+    target = tmp_path / "target.md"
+    target.write_text("old")
+    link = tmp_path / "link.md"
+    link.symlink_to(target)
+    
+    atomic_write(link, "new")
+    
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+
+
+def test_json_dumps_matches_stdlib_json():
+    """Test values orjson can't encode on its own still serialize like json."""
+    data = {1: "x", "big": 2**70, "nested": {2.5: [True, None]}}
+    
+    assert json_loads(json_dumps(data)) == json.loads(json.dumps(data))
+    assert json_loads(json_dumps(data, indent=True)) == json.loads(json.dumps(data))
+
+
+def test_atomic_write_new_file_uses_umask(tmp_path):
+    """Test a new file gets the default permissions for the process umask."""
+    umask = os.umask(0o022)
+    try:
+        atomic_write(tmp_path / "note.md", "new")
+    finally:
+        os.umask(umask)
+    
+    assert stat.S_IMODE((tmp_path / "note.md").stat().st_mode) == 0o644